@@ -18,6 +18,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import math
+
 import numpy as np
 import tensorflow as tf
 
@@ -74,6 +76,73 @@ class DistributionUtilTest(tf.test.TestCase):
           y, distribution_util.pick_vector(
               tf.constant(False), x, y))  # No eval.
 
+  def testAssertNonNegativeIntegerForm(self):
+    with self.test_session():
+      x = [0., 1., 4.]
+      with tf.control_dependencies([
+          distribution_util.assert_non_negative_integer_form(x)]):
+        tf.identity(x).eval()
+
+      with self.assertRaisesOpError("x has negative or non-integer"):
+        with tf.control_dependencies([
+            distribution_util.assert_non_negative_integer_form([-1., 2.])]):
+          tf.identity(x).eval()
+
+      with self.assertRaisesOpError("x has negative or non-integer"):
+        with tf.control_dependencies([
+            distribution_util.assert_non_negative_integer_form([0.5, 2.])]):
+          tf.identity(x).eval()
+
+      # Integer tensors only need to be checked for negative components.
+      with self.assertRaisesOpError("x has negative or non-integer"):
+        with tf.control_dependencies([
+            distribution_util.assert_non_negative_integer_form([-1, 2])]):
+          tf.identity(x).eval()
+
+  def _np_log_combinations(self, n, counts):
+    n = np.asarray(n, dtype=np.float64)
+    counts = np.asarray(counts, dtype=np.float64)
+    lgamma = np.vectorize(math.lgamma)
+    return lgamma(n + 1) - np.sum(lgamma(counts + 1), axis=-1)
+
+  def testLogCombinations(self):
+    with self.test_session():
+      n = [2., 5.]
+      counts = [[1., 1., 0.], [2., 1., 2.]]
+      log_combs = distribution_util.log_combinations(n, counts)
+      self.assertEqual((2,), log_combs.get_shape())
+      self.assertAllClose(self._np_log_combinations(n, counts),
+                          log_combs.eval())
+
+  def testLogCombinationsBroadcast(self):
+    with self.test_session():
+      # n is broadcast against the batch of counts.
+      n = 4.
+      counts = [[1., 3.], [2., 2.], [0., 4.]]
+      log_combs = distribution_util.log_combinations(n, counts)
+      self.assertEqual((3,), log_combs.get_shape())
+      self.assertAllClose(self._np_log_combinations(n, counts),
+                          log_combs.eval())
+
+      # counts is broadcast against the batch of n.
+      n = [[3.], [3.]]
+      counts = [2., 1.]
+      log_combs = distribution_util.log_combinations(n, counts)
+      self.assertEqual((2, 1), log_combs.get_shape())
+      self.assertAllClose(self._np_log_combinations(n, counts),
+                          log_combs.eval())
+
+  def testLogCombinationsDynamicShape(self):
+    with self.test_session() as sess:
+      n = tf.placeholder(tf.float32)
+      counts = tf.placeholder(tf.float32)
+      n_value = [6., 3.]
+      counts_value = [[2., 4.], [1., 2.]]
+      self.assertAllClose(
+          self._np_log_combinations(n_value, counts_value),
+          sess.run(distribution_util.log_combinations(n, counts),
+                   feed_dict={n: n_value, counts: counts_value}))
+
 
 if __name__ == "__main__":
   tf.test.main()
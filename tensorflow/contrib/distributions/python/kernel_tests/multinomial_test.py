@@ -19,6 +19,8 @@ from __future__ import print_function
 import numpy as np
 import tensorflow as tf
 
+from tensorflow.contrib.distributions.python.ops import multinomial
+
 
 class MultinomialTest(tf.test.TestCase):
 
@@ -41,6 +43,14 @@ class MultinomialTest(tf.test.TestCase):
       self.assertEqual(tf.TensorShape([2]), dist.get_event_shape())
       self.assertEqual(tf.TensorShape([3, 2]), dist.get_batch_shape())
 
+  def testNValidation(self):
+    p = [0.1, 0.9]
+    with self.test_session():
+      with self.assertRaisesOpError('n has negative or non-integer'):
+        tf.contrib.distributions.Multinomial(n=-1., p=p).mean().eval()
+      with self.assertRaisesOpError('n has negative or non-integer'):
+        tf.contrib.distributions.Multinomial(n=2.5, p=p).mean().eval()
+
   def testNProperty(self):
     p = [[0.1, 0.2, 0.7], [0.2, 0.3, 0.5]]
     n = [[3.], [4]]
@@ -65,6 +75,12 @@ class MultinomialTest(tf.test.TestCase):
       self.assertEqual((1, 3), multinom.logits.get_shape())
       self.assertAllClose(logits, multinom.logits.eval())
 
+  def testLogPmfLargeNegativeLogits(self):
+    logits = [-200., 0, 0]
+    with self.test_session():
+      multinom = tf.contrib.distributions.Multinomial(n=1., logits=logits)
+      self.assertAllClose(-200., multinom.log_pmf([1., 0, 0]).eval())
+
   def testPmfNandCountsAgree(self):
     p = [[0.1, 0.2, 0.7]]
     n = [[5.]]
@@ -89,7 +105,7 @@ class MultinomialTest(tf.test.TestCase):
       with self.assertRaisesOpError('counts do not sum to n'):
         multinom.pmf([2., 3, 2]).eval()
       # Counts are non-integers.
-      with self.assertRaisesOpError('Condition x == y.*'):
+      with self.assertRaisesOpError('Condition x >= 0 and x == floor.*'):
         multinom.pmf([1.0, 2.5, 1.5]).eval()
 
       multinom = tf.contrib.distributions.Multinomial(
@@ -171,6 +187,22 @@ class MultinomialTest(tf.test.TestCase):
       pmf.eval()
       self.assertEqual((4, 3), pmf.get_shape())
 
+  def testPmfStackedCountsMatchSeparateCalls(self):
+    with self.test_session():
+      # Shape [2, 3]
+      p = [[0.1, 0.2, 0.7], [0.3, 0.3, 0.4]]
+      n = [3., 4.]
+      dist = tf.contrib.distributions.Multinomial(n=n, p=p)
+      # Shape [4, 2, 3]
+      counts = [[[1., 1, 1], [2, 1, 1]],
+                [[3., 0, 0], [0, 0, 4]],
+                [[0., 2, 1], [1, 2, 1]],
+                [[0., 0, 3], [4, 0, 0]]]
+      log_pmf = dist.log_pmf(counts)
+      self.assertEqual((4, 2), log_pmf.get_shape())
+      self.assertAllClose([dist.log_pmf(c).eval() for c in counts],
+                          log_pmf.eval())
+
   def testMultinomialMean(self):
     with self.test_session():
       n = 5.
@@ -204,6 +236,21 @@ class MultinomialTest(tf.test.TestCase):
       self.assertEqual((4, 2, 2, 2), dist.variance().get_shape())
       self.assertAllClose(expected_variances, dist.variance().eval())
 
+  def testMultinomialVariance_nBatch(self):
+    with self.test_session():
+      # Shape [2]
+      n = [5., 10.]
+      # Shape [3]
+      p = [0.1, 0.2, 0.7]
+      dist = tf.contrib.distributions.Multinomial(n=n, p=p)
+      inner_var = np.array(
+          [[9./100, -2/100, -7/100],
+           [-2/100, 16/100, -14/100],
+           [-7/100, -14/100, 21/100]])
+      expected_variances = [5 * inner_var, 10 * inner_var]
+      self.assertEqual((2, 3, 3), dist.variance().get_shape())
+      self.assertAllClose(expected_variances, dist.variance().eval())
+
   def testVariance_multidimensional(self):
     # Shape [3, 5, 4]
     p = np.random.dirichlet([.25, .25, .25, .25], [3, 5]).astype(np.float32)
@@ -222,5 +269,56 @@ class MultinomialTest(tf.test.TestCase):
       self.assertEqual((3, 5, 4, 4), variance.get_shape())
       self.assertEqual((6, 3, 3, 3), variance2.get_shape())
 
+  def testSampleShapes(self):
+    with self.test_session():
+      # Shape [2, 3]
+      p = [[0.1, 0.2, 0.7], [0.3, 0.3, 0.4]]
+      # Shape [4, 1]
+      n = [[2.], [3.], [4.], [5.]]
+      dist = tf.contrib.distributions.Multinomial(n=n, p=p)
+      samples = dist.sample_n(7, seed=123)
+      self.assertEqual((7, 4, 2, 3), samples.get_shape())
+      self.assertAllEqual((7, 4, 2, 3), samples.eval().shape)
+
+      samples = dist.sample((5, 7), seed=123)
+      self.assertEqual((5, 7, 4, 2, 3), samples.get_shape())
+
+  def testSampleCountsSumToN(self):
+    with self.test_session():
+      p = [[0.5, 0.5], [0.1, 0.9]]
+      n = [3., 5.]
+      dist = tf.contrib.distributions.Multinomial(n=n, p=p)
+      sample_values = dist.sample_n(100, seed=123).eval()
+      self.assertFalse(np.any(sample_values < 0))
+      self.assertAllEqual(np.tile(n, [100, 1]), sample_values.sum(axis=-1))
+      # Draws are valid counts, so the pmf can be evaluated on them.
+      dist.log_pmf(sample_values).eval()
+
+  def testSampleInChunks(self):
+    chunk_elements = multinomial._SAMPLE_CHUNK_ELEMENTS
+    # Batch of 2 with 3 classes: each chunk takes at most 2 draws per batch
+    # member, so the draws do not line up with sample boundaries.
+    multinomial._SAMPLE_CHUNK_ELEMENTS = 12
+    try:
+      with self.test_session():
+        p = [[0.2, 0.3, 0.5], [0.6, 0.3, 0.1]]
+        n = [3., 5.]
+        dist = tf.contrib.distributions.Multinomial(n=n, p=p)
+        sample_values = dist.sample_n(7, seed=123).eval()
+    finally:
+      multinomial._SAMPLE_CHUNK_ELEMENTS = chunk_elements
+    self.assertEqual((7, 2, 3), sample_values.shape)
+    self.assertFalse(np.any(sample_values < 0))
+    self.assertAllEqual(np.tile(n, [7, 1]), sample_values.sum(axis=-1))
+
+  def testSampleMean(self):
+    with self.test_session():
+      p = [[0.2, 0.3, 0.5], [0.6, 0.3, 0.1]]
+      n = [4., 10.]
+      dist = tf.contrib.distributions.Multinomial(n=n, p=p)
+      sample_values = dist.sample_n(10000, seed=123).eval()
+      self.assertAllClose(
+          dist.mean().eval(), sample_values.mean(axis=0), atol=5e-2)
+
 if __name__ == '__main__':
   tf.test.main()
@@ -93,6 +93,43 @@ def assert_integer_form(
       data=data, summarize=summarize, message=message, name=name)
 
 
+def assert_non_negative_integer_form(
+    x, data=None, summarize=None, message=None,
+    name="assert_non_negative_integer_form"):
+  """Assert that x has non-negative integer components.
+
+  This is equivalent to `check_ops.assert_non_negative(x)` together with
+  `assert_integer_form(x)`, but both conditions are checked by a single
+  reduction over `x`.
+
+  Args:
+    x: Numeric `Tensor`
+    data: The tensors to print out if the condition is `False`. Defaults to
+      error message and first few entries of `x`.
+    summarize: Print this many entries of each tensor.
+    message: A string to prefix to the default message.
+    name: A name for this operation (optional).
+
+  Returns:
+    Op raising `InvalidArgumentError` if x < 0 or floor(x) != x.
+  """
+  message = message or "x has negative or non-integer components"
+  with ops.name_scope(name, values=[x]):
+    x = ops.convert_to_tensor(x, name="x")
+    if data is None:
+      data = [
+          message,
+          "Condition x >= 0 and x == floor(x) did not hold element-wise: x = ",
+          x.name, x
+      ]
+    condition = math_ops.greater_equal(x, math_ops.cast(0, x.dtype))
+    if not x.dtype.is_integer:
+      condition = math_ops.logical_and(
+          condition, math_ops.equal(x, math_ops.floor(x)))
+    return logging_ops.Assert(
+        math_ops.reduce_all(condition), data, summarize=summarize)
+
+
 def assert_symmetric(matrix):
   matrix_t = array_ops.batch_matrix_transpose(matrix)
   return control_flow_ops.with_dependencies(
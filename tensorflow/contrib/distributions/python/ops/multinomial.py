@@ -19,11 +19,21 @@ from __future__ import print_function
 
 from tensorflow.contrib.distributions.python.ops import distribution
 from tensorflow.contrib.distributions.python.ops import distribution_util
+from tensorflow.python.framework import common_shapes
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import check_ops
 from tensorflow.python.ops import control_flow_ops
 from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import nn
+from tensorflow.python.ops import random_ops
+
+
+# Upper bound on the number of elements of the per-chunk temporaries that the
+# GPU categorical sampler allocates when drawing Multinomial samples.
+_SAMPLE_CHUNK_ELEMENTS = 1 << 22
 
 
 class Multinomial(distribution.Distribution):
@@ -138,22 +148,25 @@ class Multinomial(distribution.Distribution):
         multidimensional=True)
     with ops.name_scope(name, values=[n, self._p]):
       with ops.control_dependencies([
-          check_ops.assert_non_negative(
-              n, message="n has negative components."),
-          distribution_util.assert_integer_form(
-              n, message="n has non-integer components.")
+          distribution_util.assert_non_negative_integer_form(
+              n, message="n has negative or non-integer components.")
       ] if validate_args else []):
         self._n = array_ops.identity(n, name="convert_n")
+        self._log_n_factorial = math_ops.lgamma(self._n + 1,
+                                                name="log_n_factorial")
+        if logits is None:
+          self._log_p = math_ops.log(self._p, name="log_p")
+        else:
+          # `p` is sigmoid(logits), and log(sigmoid(x)) = -softplus(-x) stays
+          # finite where sigmoid(x) underflows to zero.
+          self._log_p = -nn.softplus(-self._logits)
         self._mean_val = array_ops.expand_dims(n, -1) * self._p
-        self._broadcast_shape = math_ops.reduce_sum(
-            self._mean_val, reduction_indices=[-1], keep_dims=False)
         super(Multinomial, self).__init__(
             dtype=self._p.dtype,
             parameters={"p": self._p,
                         "n": self._n,
                         "mean": self._mean,
-                        "logits": self._logits,
-                        "broadcast_shape": self._broadcast_shape},
+                        "logits": self._logits},
             is_continuous=False,
             validate_args=validate_args,
             allow_nan_stats=allow_nan_stats,
@@ -175,25 +188,88 @@ class Multinomial(distribution.Distribution):
     return self._logits
 
   def _batch_shape(self):
-    return array_ops.shape(self._broadcast_shape)
+    # self._mean_val already has the broadcast shape of n and p.
+    return array_ops.shape(self._mean_val)[:-1]
 
   def _get_batch_shape(self):
-    return self._broadcast_shape.get_shape()
+    return common_shapes.broadcast_shape(
+        self._n.get_shape(), self._p.get_shape().with_rank_at_least(1)[:-1])
 
   def _event_shape(self):
-    return array_ops.gather(array_ops.shape(self._mean_val),
-                            [array_ops.rank(self._mean_val) - 1])
+    return array_ops.shape(self._mean_val)[-1:]
 
   def _get_event_shape(self):
     return self._mean_val.get_shape().with_rank_at_least(1)[-1:]
 
+  def _sample_n(self, n, seed=None):
+    # Draw class indices with the categorical sampler and tally them per class
+    # with unsorted_segment_sum, rather than summing one-hot encodings of the
+    # draws.  On GPU, random_ops.multinomial allocates temporaries of shape
+    # [batch, num_samples, k], so the n * max(self.n) draws per batch member
+    # are taken in chunks sized to keep those temporaries within
+    # _SAMPLE_CHUNK_ELEMENTS elements (or to one draw per chunk, if a single
+    # draw already exceeds that).
+    k = self.event_shape()[0]
+    batch_shape = self.batch_shape()
+    n_draws = math_ops.to_int32(array_ops.reshape(
+        self._n * array_ops.ones(batch_shape, dtype=self.dtype), [-1]))
+    num_batch = array_ops.shape(n_draws)[0]
+    max_draws = math_ops.reduce_max(n_draws)
+    total_draws = n * max_draws
+    chunk_size = math_ops.maximum(
+        1, math_ops.minimum(total_draws,
+                            _SAMPLE_CHUNK_ELEMENTS // (num_batch * k)))
+    logits = array_ops.reshape(
+        self._log_p + array_ops.zeros_like(self._mean_val),
+        array_ops.pack([-1, k]))
+    batch_index = array_ops.expand_dims(math_ops.range(num_batch), 1)
+    num_segments = n * num_batch * k
+
+    def _body(start, counts):
+      """Adds the tally of draws [start, start + chunk_size) to counts."""
+      draws = math_ops.to_int32(
+          random_ops.multinomial(logits, chunk_size, seed=seed))
+      draw_index = start + math_ops.range(chunk_size)
+      # Batch member b only keeps the first self.n[b] draws of each sample,
+      # and draws past total_draws in the last chunk are dropped.  The mask
+      # is formed by broadcasting a [1, chunk_size] against a [batch, 1]
+      # tensor.
+      weights = math_ops.cast(
+          math_ops.less(
+              array_ops.expand_dims(math_ops.mod(draw_index, max_draws), 0),
+              array_ops.expand_dims(n_draws, 1)), self.dtype)
+      weights *= math_ops.cast(
+          math_ops.less(draw_index, total_draws), self.dtype)
+      sample_index = math_ops.minimum(draw_index // max_draws, n - 1)
+      # Segment ids index into the flattened [n, batch, k] result.
+      segment_ids = k * (
+          array_ops.expand_dims(sample_index, 0) * num_batch +
+          batch_index) + draws
+      return [start + chunk_size,
+              counts + math_ops.unsorted_segment_sum(
+                  weights, segment_ids, num_segments)]
+
+    _, counts = control_flow_ops.while_loop(
+        lambda start, _: math_ops.less(start, total_draws),
+        _body,
+        [constant_op.constant(0, dtype=dtypes.int32),
+         array_ops.zeros(array_ops.pack([num_segments]), dtype=self.dtype)],
+        parallel_iterations=1,
+        back_prop=False)
+    final_shape = array_ops.concat(0, [array_ops.pack([n]),
+                                       batch_shape,
+                                       array_ops.pack([k])])
+    return array_ops.reshape(counts, final_shape)
+
   def _log_prob(self, counts):
     counts = self._assert_valid_sample(counts)
-    log_unnormalized_prob = math_ops.reduce_sum(
-        counts * math_ops.log(self.p),
+    # The unnormalized log-probability and the per-class factorials of the
+    # multinomial coefficient share a single reduction over the last
+    # dimension, so `counts` is only read by one reduction.
+    log_prob = math_ops.reduce_sum(
+        counts * self._log_p - math_ops.lgamma(counts + 1),
         reduction_indices=[-1])
-    log_normalizer = -distribution_util.log_combinations(self.n, counts)
-    return log_unnormalized_prob - log_normalizer
+    return log_prob + self._log_n_factorial
 
   def _prob(self, counts):
     return math_ops.exp(self._log_prob(counts))
@@ -202,24 +278,25 @@ class Multinomial(distribution.Distribution):
     return array_ops.identity(self._mean_val)
 
   def _variance(self):
-    p = self.p * array_ops.expand_dims(array_ops.ones_like(self.n), -1)
-    outer_prod = math_ops.batch_matmul(
-        array_ops.expand_dims(self._mean_val, -1),
-        array_ops.expand_dims(p, -2))
+    # The off-diagonal terms are the outer product -n * p_i * p_j, formed by
+    # broadcasting rather than a batch_matmul of a rank-1 problem.  Negating
+    # the [..., k, 1] factor avoids a separate pass over the [..., k, k] result.
+    # self._mean_val carries the full batch shape, so p needs no broadcasting
+    # against n of its own.
+    neg_outer_prod = (array_ops.expand_dims(-self._mean_val, -1) *
+                      array_ops.expand_dims(self._p, -2))
     return array_ops.batch_matrix_set_diag(
-        -outer_prod, self._mean_val - self._mean_val * p)
+        neg_outer_prod, self._mean_val * (1 - self._p))
 
   def _assert_valid_sample(self, counts):
     """Check counts for proper shape, values, then return tensor version."""
     if not self.validate_args: return counts
     return control_flow_ops.with_dependencies([
-        check_ops.assert_non_negative(
-            counts, message="counts has negative components."),
+        distribution_util.assert_non_negative_integer_form(
+            counts, message="counts have negative or non-integer components."),
         check_ops.assert_equal(
             self.n, math_ops.reduce_sum(counts, reduction_indices=[-1]),
-            message="counts do not sum to n."),
-        distribution_util.assert_integer_form(
-            counts, message="counts have non-integer components.")
+            message="counts do not sum to n.")
     ], counts)
 
 _prob_note = """
@@ -235,6 +312,10 @@ _prob_note = """
     leading dimensions, the last dimension represents counts for the
     corresponding Multinomial distribution in `self.p`. `counts` is only legal
     if it sums up to `n` and its components are equal to integer values.
+
+    Several count vectors can be evaluated against the same distribution in
+    one call by stacking them along a new leading dimension of "counts";
+    `self.p` and `self.n` are broadcast against the stack.
 """
 distribution_util.append_class_fun_doc(Multinomial.log_prob, doc_str=_prob_note)
 distribution_util.append_class_fun_doc(Multinomial.prob, doc_str=_prob_note)